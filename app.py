@@ -1,21 +1,27 @@
-from logging.handlers import QueueHandler
-
 import sys
 # setting path
 sys.path.append('./GUI')
 
-from typing import Tuple
-from PySide6.QtWidgets import (
-    QApplication
-)
 
-from PySide6.QtGui import QScreen
+def main():
+    # Qt is only loaded when the GUI is actually launched, the generators
+    # live in the headless `scripts` package
+    from PySide6.QtWidgets import QApplication
+
+    import GUI.main as main_window
+    from scripts.execution_policy import ExecutionPolicy
+
+    # One image at a time: let OpenCV thread inside it, but keep a core free for Qt
+    policy = ExecutionPolicy(reserved_cores=1)
+    policy.apply(policy.plan(1))
+
+    app = QApplication(sys.argv)
 
-import GUI.main as main
+    w = main_window.MainWindow()
 
-app = QApplication(sys.argv)
+    w.show()
+    return app.exec()
 
-w = main.MainWindow()
 
-w.show()
-app.exec()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
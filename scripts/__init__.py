@@ -0,0 +1,46 @@
+import importlib
+
+# Headless core: nothing here may import Qt, matplotlib or a model backend.
+# Generators are registered as "module:Class" strings and only imported when
+# asked for, so a batch worker pays for the backends it actually uses.
+GENERATORS = {
+    "canny": "scripts.mask_generator:CannyGenerator",
+    "threshold": "scripts.mask_generator:ThreshGenerator",
+}
+
+_LAZY_ATTRIBUTES = {
+    "MaskGenerator": "scripts.mask_generator",
+    "CannyGenerator": "scripts.mask_generator",
+    "ThreshGenerator": "scripts.mask_generator",
+    "ExecutionPolicy": "scripts.execution_policy",
+    "DEFAULT_POLICY": "scripts.execution_policy",
+}
+
+
+def register_generator(name : str, target : str):
+    if ":" not in target:
+        raise ValueError(f"Generator target must be 'module:Class', got '{target}'")
+    GENERATORS[name] = target
+
+
+def available_generators() -> list:
+    return sorted(GENERATORS)
+
+
+def load_target(target : str):
+    module_name, class_name = target.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def get_generator(name : str):
+    try:
+        target = GENERATORS[name]
+    except KeyError:
+        raise KeyError(f"Unknown generator '{name}', available : {', '.join(available_generators())}") from None
+    return load_target(target)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module 'scripts' has no attribute '{name}'")
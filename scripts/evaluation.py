@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+import numpy as np
+import cv2 as cv
+
+import scripts
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".tif", ".tiff", ".png")
+
+
+def find_pairs(images_dir : str, masks_dir : str) -> list:
+    # Ground-truth masks are matched to images by file name, whatever their extension
+    masks = {}
+    for name in os.listdir(masks_dir):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in IMAGE_EXTENSIONS:
+            masks[stem] = os.path.join(masks_dir, name)
+
+    pairs = []
+    for name in sorted(os.listdir(images_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in IMAGE_EXTENSIONS and stem in masks:
+            pairs.append((os.path.join(images_dir, name), masks[stem]))
+    return pairs
+
+
+def load_ground_truth(mask_path : str) -> np.ndarray:
+    mask = cv.imread(mask_path, cv.IMREAD_GRAYSCALE)
+    if mask is None:
+        raise FileNotFoundError(f"Cannot read ground-truth mask '{mask_path}'")
+    return mask > 127
+
+
+def binarize(mask : np.ndarray, shape : tuple) -> np.ndarray:
+    # Proxy or tiled generators may return a mask at another resolution
+    if mask.shape[:2] != shape:
+        mask = cv.resize(mask, (shape[1], shape[0]), interpolation=cv.INTER_NEAREST)
+    return mask > 0
+
+
+def iou(pred : np.ndarray, gt : np.ndarray) -> float:
+    inter = np.count_nonzero(pred & gt)
+    union = np.count_nonzero(pred | gt)
+    return inter / union if union > 0 else 1.0
+
+
+def boundary(mask : np.ndarray) -> np.ndarray:
+    mask = mask.astype(np.uint8)
+    return (mask - cv.erode(mask, np.ones((3, 3), np.uint8))).astype(bool)
+
+
+def boundary_f_score(pred : np.ndarray, gt : np.ndarray, tolerance : int = 2) -> float:
+    pred_b = boundary(pred)
+    gt_b = boundary(gt)
+    n_pred = np.count_nonzero(pred_b)
+    n_gt = np.count_nonzero(gt_b)
+    if n_pred == 0 and n_gt == 0:
+        return 1.0
+    if n_pred == 0 or n_gt == 0:
+        return 0.0
+
+    # A boundary pixel is matched if the other boundary is within `tolerance` pixels
+    kernel = cv.getStructuringElement(cv.MORPH_ELLIPSE, (2 * tolerance + 1, 2 * tolerance + 1))
+    precision = np.count_nonzero(pred_b & cv.dilate(gt_b.astype(np.uint8), kernel).astype(bool)) / n_pred
+    recall = np.count_nonzero(gt_b & cv.dilate(pred_b.astype(np.uint8), kernel).astype(bool)) / n_gt
+    if precision + recall == 0:
+        return 0.0
+    return 2 * precision * recall / (precision + recall)
+
+
+class EvaluationResult():
+    def __init__(self, name : str, images : list, times : np.ndarray, ious : np.ndarray, f_scores : np.ndarray):
+        self.name = name
+        self.images = images
+        self.times = times
+        self.ious = ious
+        self.f_scores = f_scores
+
+    @property
+    def throughput(self) -> float:
+        total = self.times.sum()
+        return len(self.times) / total if total > 0 else 0.0
+
+    @property
+    def mean_iou(self) -> float:
+        return float(self.ious.mean()) if len(self.ious) else 0.0
+
+    @property
+    def mean_f_score(self) -> float:
+        return float(self.f_scores.mean()) if len(self.f_scores) else 0.0
+
+    def per_image(self) -> list:
+        return [
+            {"image": image, "time": float(t), "iou": float(i), "boundary_f": float(f)}
+            for image, t, i, f in zip(self.images, self.times, self.ious, self.f_scores)
+        ]
+
+
+def time_generate(generator, img_path : str, repeat : int = 5):
+    # Returns the last mask and the median time over `repeat` runs
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        mask = generator.generate_mask(img_path)
+        timings.append(time.perf_counter() - start)
+    return mask, statistics.median(timings)
+
+
+def evaluate(name : str, generator, pairs : list, tolerance : int = 2, repeat : int = 5) -> EvaluationResult:
+    # Untimed warm-up so OpenCV's first-use cost does not land on whichever configuration runs first
+    if pairs:
+        generator.generate_mask(pairs[0][0])
+
+    # Scores are computed image by image so only one pair of masks is held at a time
+    times = np.empty(len(pairs))
+    ious = np.empty(len(pairs))
+    f_scores = np.empty(len(pairs))
+    for index, (img_path, mask_path) in enumerate(pairs):
+        mask, times[index] = time_generate(generator, img_path, max(1, repeat))
+
+        gt = load_ground_truth(mask_path)
+        pred = binarize(mask, gt.shape)
+        ious[index] = iou(pred, gt)
+        f_scores[index] = boundary_f_score(pred, gt, tolerance)
+
+    return EvaluationResult(name, [img_path for img_path, _ in pairs], times, ious, f_scores)
+
+
+def pareto_front(results : list) -> list:
+    # A configuration is kept if no other one is at least as fast and as accurate, and strictly better on one
+    front = []
+    for result in results:
+        dominated = any(
+            other.throughput >= result.throughput and other.mean_iou >= result.mean_iou
+            and (other.throughput > result.throughput or other.mean_iou > result.mean_iou)
+            for other in results
+        )
+        if not dominated:
+            front.append(result)
+    return sorted(front, key=lambda result: result.throughput, reverse=True)
+
+
+def format_report(results : list) -> str:
+    front = pareto_front(results)
+    lines = [f"{'configuration':<30} {'img/s':>8} {'IoU':>7} {'bound F':>8}  pareto"]
+    for result in sorted(results, key=lambda result: result.throughput, reverse=True):
+        lines.append(f"{result.name:<30} {result.throughput:8.2f} {result.mean_iou:7.4f} {result.mean_f_score:8.4f}  {'*' if result in front else ''}")
+    return "\n".join(lines)
+
+
+def load_configurations(config_path : str) -> dict:
+    # {"name": {"generator": "canny" or "module:Class", "params": {...}}, ...}
+    with open(config_path) as f:
+        config = json.load(f)
+
+    configurations = {}
+    for name, entry in config.items():
+        generator = entry["generator"]
+        generator_class = scripts.load_target(generator) if ":" in generator else scripts.get_generator(generator)
+        configurations[name] = generator_class(**entry.get("params", {}))
+    return configurations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate mask generators against ground-truth masks")
+    parser.add_argument("images", help="folder of images")
+    parser.add_argument("masks", help="folder of ground-truth masks, matched to the images by file name")
+    parser.add_argument("config", help="JSON file of configurations to compare")
+    parser.add_argument("-t", "--tolerance", type=int, default=2, help="boundary F-score tolerance in pixels")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="timed runs per image, the median is kept")
+    parser.add_argument("-o", "--output", help="write per-image results to this JSON file")
+    args = parser.parse_args(argv)
+
+    pairs = find_pairs(args.images, args.masks)
+    if not pairs:
+        parser.error(f"No image in '{args.images}' has a mask in '{args.masks}'")
+
+    results = [evaluate(name, generator, pairs, args.tolerance, args.repeat) for name, generator in load_configurations(args.config).items()]
+    print(format_report(results))
+
+    if args.output:
+        front = pareto_front(results)
+        with open(args.output, "w") as f:
+            json.dump({
+                result.name: {
+                    "throughput": result.throughput,
+                    "mean_iou": result.mean_iou,
+                    "mean_boundary_f": result.mean_f_score,
+                    "pareto": result in front,
+                    "images": result.per_image(),
+                } for result in results
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import os
+import time
+from functools import partial
+
+import cv2 as cv
+
+INTRA_IMAGE = "intra"
+INTER_IMAGE = "inter"
+
+# Below this many pixels OpenCV's thread pool costs more than it gains,
+# above it a single image can keep several cores busy on its own
+LARGE_IMAGE_PIXELS = 2000 * 2000
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def current_affinity():
+    try:
+        return os.sched_getaffinity(0)
+    except AttributeError:
+        # Not supported on this platform (macOS, Windows)
+        return None
+
+
+def set_affinity(cores):
+    if cores is None:
+        return
+    try:
+        os.sched_setaffinity(0, cores)
+    except AttributeError:
+        # Not supported on this platform (macOS, Windows)
+        pass
+
+
+def image_pixels(img_path) -> int:
+    # Decode at 1/8 scale, far cheaper than a full read just to learn the size
+    img = cv.imread(img_path, cv.IMREAD_REDUCED_GRAYSCALE_8)
+    if img is None:
+        return 0
+    h, w = img.shape[:2]
+    return h * w * 64
+
+
+def _init_worker(threads : int, affinity : list):
+    set_affinity(affinity)
+    cv.setNumThreads(threads)
+
+
+def _timed_generate(generate_mask, img_path):
+    # Runs in the worker: its cpu time is reported back with the mask since
+    # child process times are coarse on Linux and not available on Windows
+    start = time.process_time()
+    mask = generate_mask(img_path)
+    return mask, time.process_time() - start
+
+
+class ExecutionPlan():
+    def __init__(self, mode : str, workers : int, threads_per_worker : int):
+        self.mode = mode
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+
+    def __repr__(self):
+        return f"ExecutionPlan(mode={self.mode}, workers={self.workers}, threads_per_worker={self.threads_per_worker})"
+
+
+class UtilisationReport():
+    def __init__(self, plan : ExecutionPlan, cores : int, n_images : int, wall_time : float, cpu_time : float):
+        self.plan = plan
+        self.cores = cores
+        self.n_images = n_images
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+
+    @property
+    def cores_used(self) -> float:
+        return self.cpu_time / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def utilisation(self) -> float:
+        return self.cores_used / self.cores if self.cores > 0 else 0.0
+
+    @property
+    def images_per_second(self) -> float:
+        return self.n_images / self.wall_time if self.wall_time > 0 else 0.0
+
+    def __str__(self):
+        return (f"{self.n_images} images in {self.wall_time:.2f}s ({self.images_per_second:.2f} img/s), "
+                f"{self.plan.mode} mode with {self.plan.workers} worker(s) x {self.plan.threads_per_worker} thread(s), "
+                f"{self.cores_used:.2f}/{self.cores} cores used ({self.utilisation:.0%})")
+
+
+class ExecutionPolicy():
+    def __init__(self, max_cores : int = None, reserved_cores : int = 0, max_threads_per_worker : int = None, affinity : list = None, large_image_pixels : int = LARGE_IMAGE_PIXELS):
+        self.affinity = None
+        if affinity:
+            usable = current_affinity()
+            if usable is None:
+                self.affinity = sorted(set(affinity))
+                cores = min(len(self.affinity), os.cpu_count() or 1)
+            else:
+                self.affinity = sorted(set(affinity) & usable)
+                if not self.affinity:
+                    raise ValueError(f"None of the CPUs {sorted(set(affinity))} are available, usable CPUs : {sorted(usable)}")
+                cores = len(self.affinity)
+        else:
+            cores = available_cores()
+        if max_cores:
+            cores = min(cores, max_cores)
+        self.cores = max(1, cores - reserved_cores)
+        self.max_threads_per_worker = max_threads_per_worker
+        self.large_image_pixels = large_image_pixels
+
+    def cap_threads(self, threads : int) -> int:
+        if self.max_threads_per_worker:
+            threads = min(threads, self.max_threads_per_worker)
+        return max(1, threads)
+
+    def plan(self, n_images : int, pixels : int = 0) -> ExecutionPlan:
+        threads = self.cap_threads(self.cores)
+        if n_images <= 1 or self.cores == 1:
+            return ExecutionPlan(INTRA_IMAGE, 1, threads)
+
+        # A few images large enough to saturate the cores by themselves:
+        # parallelise inside each image, unless the per-worker thread cap
+        # leaves cores idle, in which case run as many capped workers as fit
+        if pixels >= self.large_image_pixels and n_images < self.cores:
+            workers = min(n_images, self.cores // threads)
+            if workers == 1:
+                return ExecutionPlan(INTRA_IMAGE, 1, threads)
+            return ExecutionPlan(INTER_IMAGE, workers, threads)
+
+        # Otherwise one process per image, sharing the cores between them so
+        # that workers * threads never exceeds what we are allowed to use
+        workers = min(n_images, self.cores)
+        threads = self.cap_threads(self.cores // workers)
+        return ExecutionPlan(INTER_IMAGE, workers, threads)
+
+    def apply(self, plan : ExecutionPlan):
+        # Changes process-wide state: meant for process startup, batch runs
+        # go through run() which restores the caller's settings
+        set_affinity(self.affinity)
+        cv.setNumThreads(plan.threads_per_worker)
+
+    def run(self, generate_mask, img_paths : list):
+        img_paths = list(img_paths)
+        pixels = image_pixels(img_paths[0]) if img_paths else 0
+        plan = self.plan(len(img_paths), pixels)
+
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        workers_cpu = 0.0
+
+        if plan.mode == INTRA_IMAGE:
+            previous_threads = cv.getNumThreads()
+            previous_affinity = current_affinity()
+            try:
+                self.apply(plan)
+                masks = [generate_mask(img_path) for img_path in img_paths]
+            finally:
+                set_affinity(previous_affinity)
+                cv.setNumThreads(previous_threads)
+        else:
+            # Only batch runs pay for the process pool machinery
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=plan.workers, initializer=_init_worker, initargs=(plan.threads_per_worker, self.affinity)) as executor:
+                results = list(executor.map(partial(_timed_generate, generate_mask), img_paths))
+            masks = [mask for mask, _ in results]
+            workers_cpu = sum(cpu for _, cpu in results)
+
+        wall_time = time.perf_counter() - start_wall
+        cpu_time = time.process_time() - start_cpu + workers_cpu
+
+        return masks, UtilisationReport(plan, self.cores, len(img_paths), wall_time, cpu_time)
+
+
+DEFAULT_POLICY = ExecutionPolicy()
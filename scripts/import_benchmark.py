@@ -0,0 +1,61 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Each import is timed in a fresh interpreter, like a freshly spawned worker
+MODULES = [
+    "scripts",
+    "scripts.execution_policy",
+    "scripts.mask_generator",
+]
+
+# Must never be pulled in by the headless core
+HEAVY_MODULES = ["PySide6", "matplotlib", "torch", "segment_anything"]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def time_import(module : str, repeat : int = 5):
+    # Returns (median seconds, heavy modules loaded, error output or None)
+    timings = []
+    heavy = ""
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                                 capture_output=True, text=True)
+        if process.returncode != 0:
+            return None, "", process.stderr.strip()
+        output = process.stdout.split()
+        timings.append(float(output[0]))
+        heavy = output[1] if len(output) > 1 else ""
+    return statistics.median(timings), heavy, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the import time of the mask generation core")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        elapsed, heavy, error = time_import(module, args.repeat)
+        if error is not None:
+            print(f"{module:<30} {'failed':>11}")
+            print("    " + error.replace("\n", "\n    "))
+            failed = True
+            continue
+        print(f"{module:<30} {elapsed * 1000:8.1f} ms" + (f"   imports {heavy}" if heavy else ""))
+        failed |= bool(heavy)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,7 @@
 import numpy as np
-import glob
-import matplotlib.pyplot as plt
 import cv2 as cv
-import os
+
+from scripts.execution_policy import ExecutionPolicy, DEFAULT_POLICY
 
 '''import torch
 from segment_anything import SamPredictor, sam_model_registry'''
@@ -63,6 +62,11 @@ class MaskGenerator():
     def generate_mask(self, img_path) -> np.ndarray:
         pass
 
+    def generate_masks(self, img_paths : list, policy : ExecutionPolicy = None):
+        # Returns the masks in the order of img_paths and a UtilisationReport
+        policy = policy if policy else DEFAULT_POLICY
+        return policy.run(self.generate_mask, img_paths)
+
 class CannyGenerator(MaskGenerator):
     def __init__(self, thresh_min : int, thresh_max : int, blur : int, morpho : int, floodfill : bool, draw_contour : bool):
         super(CannyGenerator, self).__init__(blur, morpho)
@@ -159,8 +163,6 @@ class ThreshGenerator(MaskGenerator):
 
 
 
-np.random.seed(12345)
-
 ''' To keep if we do segment_anything
 
 CHECKPOINT_PATH = "sam_vit_h_4b8939.pth"